@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the API test scripts
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import sys
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+
+try:
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj)
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    import json
+
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
+
+    def json_loads(data):
+        return json.loads(data)
+
+    def json_pretty(obj):
+        return json.dumps(obj, indent=2)
+
+# API base URL
+BASE_URL = "http://localhost:8000"
+
+# Generated binary fixtures (PDF, DOCX) kept between runs
+FIXTURE_CACHE_DIR = Path(".fixture_cache")
+
+# Localhost calls should fail fast rather than retry
+NO_RETRY = Retry(total=0, connect=0, read=0, redirect=0)
+
+def new_session(max_retries=NO_RETRY):
+    """Create a keep-alive session so consecutive calls reuse one pooled connection"""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=max_retries))
+    session.headers.update({"User-Agent": "docMgr-test/1.0"})
+    return session
+
+# Session shared by every script that does not need its own retry policy
+SESSION = new_session()
+atexit.register(SESSION.close)
+
+# Maximum number of status lines held in memory before they are written out
+LOG_BUFFER_CAPACITY = 256
+
+# Status lines are held in memory and written to stdout together when a script
+# calls flush_log() after each test, when the buffer fills, or at exit; errors
+# are written out immediately
+log = logging.getLogger("docmgr.tests")
+if not log.handlers:
+    log.addHandler(logging.handlers.MemoryHandler(
+        LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=logging.StreamHandler(sys.stdout)
+    ))
+    # DOCMGR_TEST_LOG=DEBUG also prints the raw response bodies of failed requests
+    log.setLevel(os.getenv("DOCMGR_TEST_LOG", "INFO").upper())
+    log.propagate = False
+
+def flush_log():
+    """Write out any buffered status lines"""
+    for handler in log.handlers:
+        handler.flush()
+
+class LazyText:
+    """Log argument that decodes a response body only if the record is emitted"""
+    __slots__ = ("response",)
+    
+    def __init__(self, response):
+        self.response = response
+    
+    def __str__(self):
+        return self.response.text
+
+# Multipart content types for the fixture formats the test scripts upload
+CONTENT_TYPES = {
+    ".txt": "text/plain",
+    ".md": "text/markdown",
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".bmp": "image/bmp",
+    ".tiff": "image/tiff",
+}
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def post_json(session, url, payload):
+    """POST a JSON body encoded with json_dumps"""
+    return session.post(url, data=json_dumps(payload), headers=JSON_HEADERS)
+
+def content_type_for(filename):
+    """Look up the multipart content type for a filename by its extension"""
+    return CONTENT_TYPES.get(os.path.splitext(filename)[1].lower(), "application/octet-stream")
+
+def build_upload(filename, data, description):
+    """Build the files and form data for the single-file upload endpoint"""
+    return {"file": (filename, data, content_type_for(filename))}, {"description": description}
+
+def cached_fixture(filename, build, source):
+    """Return fixture bytes from the on-disk cache, rebuilding them when source is newer"""
+    cache_path = FIXTURE_CACHE_DIR / filename
+    try:
+        stat = cache_path.stat()
+        if stat.st_size > 0 and stat.st_mtime >= os.path.getmtime(source):
+            return cache_path.read_bytes()
+    except OSError:
+        pass
+    
+    data = build()
+    # Write to a per-process temp file and rename it into place, so a concurrent
+    # run never reads a half-written fixture; a cache that cannot be written is
+    # just a miss next time
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        FIXTURE_CACHE_DIR.mkdir(exist_ok=True)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+    return data
+
+def upload_batch(session, items, description):
+    """Upload several files in a single multipart request to the bulk upload endpoint
+    
+    Each item is either a path on disk or an in-memory (filename, data) pair.
+    """
+    # Hand requests the open file objects rather than a bytes copy of each file;
+    # the ExitStack closes every handle once the request has been sent
+    with ExitStack() as stack:
+        files = []
+        for item in items:
+            if isinstance(item, tuple):
+                name, data = item
+            else:
+                name, data = Path(item).name, stack.enter_context(open(item, "rb"))
+            files.append(("files", (name, data, content_type_for(name))))
+        return session.post(f"{BASE_URL}/api/documents/upload-multiple", files=files, data={"description": description})
+
+def delete_documents(session, doc_ids):
+    """Delete documents concurrently and return the responses in the order of doc_ids"""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return list(executor.map(lambda doc_id: session.delete(f"{BASE_URL}/api/documents/{doc_id}"), doc_ids))
@@ -1,12 +1,13 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
 import shutil
 from typing import List
 import uuid
 from models.document import DocumentResponse, BulkUploadResponse
 from models.chunk import SearchResult, DocumentChunk
-from models.dataModels import SearchQuery, CollectionStats
+from models.dataModels import SearchQuery, BatchSearchQuery, BatchChunksQuery, CollectionStats, EmbeddingCacheStats
 from db import get_db_connection, init_db
 from repository.vector_pipeline import VectorPipeline
 from dotenv import load_dotenv
@@ -16,6 +17,14 @@ from models.user_models import UserRegistration,AuthResponse, UserResponse
 from repository.user_manager import UserManager
 from repository.chat_manager import ChatManager
 from repository.auth_dependencies import get_current_user, get_current_active_user
+
+# Serialize the larger search, chunk and upload payloads with orjson when it is installed
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:
+    FastJSONResponse = JSONResponse
+
 #Initialize database and create FastAPI app
 app = FastAPI(title="Document Manager API", version="1.0.0")
 
@@ -136,7 +145,7 @@ def process_document_with_vector_pipeline(file_path: str, content_type: str, doc
         return None
 
 
-@app.post("/api/documents/upload", response_model=DocumentResponse)
+@app.post("/api/documents/upload", response_model=DocumentResponse, response_class=FastJSONResponse)
 async def upload_document(
     file: UploadFile = File(...),
     description: str | None = None
@@ -144,7 +153,7 @@ async def upload_document(
     """Upload a new document"""
     return process_single_document(file, description)
 
-@app.post("/api/documents/upload-multiple", response_model=BulkUploadResponse)
+@app.post("/api/documents/upload-multiple", response_model=BulkUploadResponse, response_class=FastJSONResponse)
 async def upload_multiple_documents(
     files: List[UploadFile] = File(...),
     description: str | None = None
@@ -246,7 +255,7 @@ async def delete_document(document_id: int):
     return {"message": "Document deleted successfully"}
 
 # Vector pipeline endpoints
-@app.post("/api/search", response_model=List[SearchResult])
+@app.post("/api/search", response_model=List[SearchResult], response_class=FastJSONResponse)
 async def search_documents(query: SearchQuery):
     """Search documents by semantic similarity"""
     if not VECTOR_PIPELINE_AVAILABLE:
@@ -258,7 +267,19 @@ async def search_documents(query: SearchQuery):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
-@app.get("/api/documents/{document_id}/chunks", response_model=List[DocumentChunk])
+@app.post("/api/search/batch", response_model=List[List[SearchResult]], response_class=FastJSONResponse)
+async def search_documents_batch(query: BatchSearchQuery):
+    """Search documents by semantic similarity for several queries at once"""
+    if not VECTOR_PIPELINE_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Vector pipeline not available")
+    
+    try:
+        results = vector_pipeline.search_documents_batch(query.queries, query.n_results)
+        return results
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+@app.get("/api/documents/{document_id}/chunks", response_model=List[DocumentChunk], response_class=FastJSONResponse)
 async def get_document_chunks(document_id: int):
     """Get all chunks for a specific document"""
     if not VECTOR_PIPELINE_AVAILABLE:
@@ -270,6 +291,18 @@ async def get_document_chunks(document_id: int):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve chunks: {str(e)}")
 
+@app.post("/api/documents/chunks/batch", response_model=List[List[DocumentChunk]], response_class=FastJSONResponse)
+async def get_chunks_for_documents(query: BatchChunksQuery):
+    """Get the chunks of several documents in one request, one list per document id"""
+    if not VECTOR_PIPELINE_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Vector pipeline not available")
+    
+    try:
+        chunks = vector_pipeline.get_chunks_for_documents(query.document_ids)
+        return chunks
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve chunks: {str(e)}")
+
 @app.get("/api/vector/stats", response_model=CollectionStats)
 async def get_vector_stats():
     """Get statistics about the vector collection"""
@@ -282,6 +315,14 @@ async def get_vector_stats():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
 
+@app.get("/api/vector/cache/stats", response_model=EmbeddingCacheStats)
+async def get_embedding_cache_stats():
+    """Get hit/miss statistics for the embedding cache"""
+    if not VECTOR_PIPELINE_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Vector pipeline not available")
+    
+    return vector_pipeline.get_embedding_cache_stats()
+
 @app.post("/api/documents/{document_id}/reprocess")
 async def reprocess_document(document_id: int):
     """Reprocess a document through the vector pipeline"""
@@ -356,12 +397,18 @@ async def get_user_profile(session_token: str):
         raise HTTPException(status_code=500, detail=f"Failed to retrieve profile: {str(e)}")
 
 
+@app.api_route("/health", methods=["GET", "HEAD"])
+async def health():
+    """Lightweight liveness probe"""
+    return {"status": "ok"}
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
     endpoints = {
         "upload_single": "POST /api/documents/upload",
         "upload_multiple": "POST /api/documents/upload-multiple",
+        "health": "GET /health",
         "list": "GET /api/documents",
         "get": "GET /api/documents/{id}",
         "delete": "DELETE /api/documents/{id}"
@@ -371,8 +418,11 @@ async def root():
     if VECTOR_PIPELINE_AVAILABLE:
         endpoints.update({
             "search": "POST /api/search",
+            "search_batch": "POST /api/search/batch",
             "chunks": "GET /api/documents/{id}/chunks",
+            "chunks_batch": "POST /api/documents/chunks/batch",
             "vector_stats": "GET /api/vector/stats",
+            "embedding_cache_stats": "GET /api/vector/cache/stats",
             "reprocess": "POST /api/documents/{id}/reprocess"
         })
     
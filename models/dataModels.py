@@ -15,8 +15,21 @@ class SearchQuery(BaseModel):
     query: str
     n_results: int = 5
 
+class BatchSearchQuery(BaseModel):
+    queries: List[str]
+    n_results: int = 5
+
+class BatchChunksQuery(BaseModel):
+    document_ids: List[int]
+
 class CollectionStats(BaseModel):
     total_chunks: int
     collection_name: str
     sample_metadata: Optional[Dict[str, Any]] = None
-    error: Optional[str] = None
\ No newline at end of file
+    error: Optional[str] = None
+
+class EmbeddingCacheStats(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
@@ -3,8 +3,12 @@ Vector Pipeline for Document Ingestion
 Handles document chunking, embedding generation, and vector storage
 """
 
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
+import hashlib
+import threading
 import markdown
+import numpy as np
 import tiktoken
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from sentence_transformers import SentenceTransformer
@@ -14,6 +18,12 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Maximum number of text embeddings kept in memory, keyed by content hash
+EMBEDDING_CACHE_SIZE = 4096
+
+# Number of chunks sent through the model per forward pass
+EMBEDDING_BATCH_SIZE = 64
+
 class VectorPipeline:
     def __init__(self):
         """Initialize the vector pipeline with sentence-transformers and ChromaDB"""
@@ -44,6 +54,13 @@ class VectorPipeline:
         
         # Tokenizer for counting tokens
         self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        
+        # LRU of float32 embedding rows keyed by the SHA-256 of the embedded text, so
+        # unchanged content that is uploaded again does not go back through the model
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+        self._embedding_cache_hits = 0
+        self._embedding_cache_misses = 0
     
     def _count_tokens(self, text: str) -> int:
         """Count tokens in text using tiktoken"""
@@ -250,26 +267,45 @@ class VectorPipeline:
         return self.text_splitter.split_text(text)
     
     def _generate_embeddings(self, chunks: List[str]) -> List[List[float]]:
-        """Generate embeddings for text chunks using sentence-transformers"""
+        """Generate embeddings for text chunks, encoding only those not already cached"""
         try:
-            # Generate embeddings locally using sentence-transformers
-            embeddings = self.embedding_model.encode(chunks, convert_to_tensor=False)
-            # Convert to list of lists of floats
-            if hasattr(embeddings, 'tolist'):
-                return embeddings.tolist()
-            elif isinstance(embeddings, list):
-                return embeddings
-            else:
-                # Handle numpy array case
-                import numpy as np
-                if isinstance(embeddings, np.ndarray):
-                    return embeddings.tolist()
-                else:
-                    # Fallback: convert to list
-                    return [list(emb) for emb in embeddings]
+            keys = [hashlib.sha256(chunk.encode("utf-8")).hexdigest() for chunk in chunks]
+            with self._embedding_cache_lock:
+                embeddings = [self._embedding_cache.get(key) for key in keys]
+                for key, embedding in zip(keys, embeddings):
+                    if embedding is not None:
+                        self._embedding_cache.move_to_end(key)
+            
+            # Encode every cache miss in a single model call
+            missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+            with self._embedding_cache_lock:
+                self._embedding_cache_hits += len(chunks) - len(missing)
+                self._embedding_cache_misses += len(missing)
+            if missing:
+                new_embeddings = self._encode([chunks[i] for i in missing])
+                with self._embedding_cache_lock:
+                    for i, embedding in zip(missing, new_embeddings):
+                        # Copy the row so a cached entry does not keep its whole batch alive
+                        embeddings[i] = self._embedding_cache[keys[i]] = embedding.copy()
+                    while len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                        self._embedding_cache.popitem(last=False)
+            
+            # Chroma takes plain lists; convert only on the way out of the cache
+            return [embedding.tolist() for embedding in embeddings]
         except Exception as e:
             raise Exception(f"Error generating embeddings: {str(e)}")
     
+    def _encode(self, chunks: List[str]) -> np.ndarray:
+        """Encode text chunks with sentence-transformers into a float32 array, one row per chunk"""
+        # Generate unit-length embeddings locally using sentence-transformers
+        embeddings = self.embedding_model.encode(
+            chunks,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+    
     def process_document(self, file_path: str, content_type: str, document_id: int, 
                         original_filename: str, description: Optional[str] = None) -> Dict[str, Any]:
         """Process a document through the vector pipeline"""
@@ -285,34 +321,36 @@ class VectorPipeline:
             
             # Store in vector database
             chunk_ids = []
-            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-                chunk_id = f"{document_id}_{i}"
-                chunk_ids.append(chunk_id)
+            metadatas = []
+            chunk_sizes = [self._count_tokens(chunk) for chunk in chunks]
+            for i, chunk_size in enumerate(chunk_sizes):
+                chunk_ids.append(f"{document_id}_{i}")
                 
                 # Prepare metadata, ensuring no None values
-                metadata = {
+                metadatas.append({
                     "document_id": document_id,
                     "chunk_index": i,
                     "original_filename": original_filename,
                     "content_type": content_type,
                     "description": description or "",  # Convert None to empty string
-                    "chunk_size": self._count_tokens(chunk),
+                    "chunk_size": chunk_size,
                     "total_chunks": len(chunks)
-                }
-                
-                # Store chunk metadata and embedding
+                })
+            
+            # Store every chunk's metadata and embedding in a single write
+            if chunks:
                 self.collection.add(
-                    embeddings=[embedding],
-                    documents=[chunk],
-                    metadatas=[metadata],
-                    ids=[chunk_id]
+                    embeddings=embeddings,
+                    documents=chunks,
+                    metadatas=metadatas,
+                    ids=chunk_ids
                 )
             
             return {
                 "document_id": document_id,
                 "original_filename": original_filename,
                 "total_chunks": len(chunks),
-                "total_tokens": sum(self._count_tokens(chunk) for chunk in chunks),
+                "total_tokens": sum(chunk_sizes),
                 "chunk_ids": chunk_ids,
                 "status": "processed"
             }
@@ -325,6 +363,19 @@ class VectorPipeline:
                 "error": str(e)
             }
     
+    def _format_search_results(self, results: Dict[str, Any], query_index: int = 0) -> List[Dict[str, Any]]:
+        """Format the Chroma query results for one query embedding"""
+        formatted_results = []
+        if results and 'ids' in results and results['ids'] and len(results['ids']) > query_index:
+            for i in range(len(results['ids'][query_index])):
+                formatted_results.append({
+                    "chunk_id": results['ids'][query_index][i],
+                    "content": results['documents'][query_index][i],
+                    "metadata": results['metadatas'][query_index][i],
+                    "similarity_score": 1 - results['distances'][query_index][i]  # Convert distance to similarity
+                })
+        return formatted_results
+    
     def search_documents(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
         """Search documents by semantic similarity"""
         try:
@@ -339,17 +390,28 @@ class VectorPipeline:
             )
             
             # Format results
-            formatted_results = []
-            if results and 'ids' in results and results['ids'] and len(results['ids']) > 0:
-                for i in range(len(results['ids'][0])):
-                    formatted_results.append({
-                        "chunk_id": results['ids'][0][i],
-                        "content": results['documents'][0][i],
-                        "metadata": results['metadatas'][0][i],
-                        "similarity_score": 1 - results['distances'][0][i]  # Convert distance to similarity
-                    })
+            return self._format_search_results(results)
+            
+        except Exception as e:
+            raise Exception(f"Error searching documents: {str(e)}")
+    
+    def search_documents_batch(self, queries: List[str], n_results: int = 5) -> List[List[Dict[str, Any]]]:
+        """Search documents for several queries, returning one result list per query"""
+        if not queries:
+            return []
+        
+        try:
+            # Encode every query in a single batched forward pass
+            query_embeddings = self._generate_embeddings(queries)
+            
+            # One vector database query covers all the embeddings
+            results = self.collection.query(
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                include=["documents", "metadatas", "distances"]
+            )
             
-            return formatted_results
+            return [self._format_search_results(results, i) for i in range(len(queries))]
             
         except Exception as e:
             raise Exception(f"Error searching documents: {str(e)}")
@@ -376,6 +438,36 @@ class VectorPipeline:
         except Exception as e:
             raise Exception(f"Error retrieving document chunks: {str(e)}")
     
+    def get_chunks_for_documents(self, document_ids: List[int]) -> List[List[Dict[str, Any]]]:
+        """Get the chunks of several documents at once, returning one list per document id"""
+        if not document_ids:
+            return []
+        
+        try:
+            # One vector database read covers every requested document
+            results = self.collection.get(
+                where={"document_id": {"$in": list(document_ids)}},
+                include=["documents", "metadatas"]
+            )
+            
+            chunks_by_document = {document_id: [] for document_id in document_ids}
+            if results and 'ids' in results and results['ids']:
+                for i in range(len(results['ids'])):
+                    metadata = results['metadatas'][i]
+                    chunks_by_document.setdefault(metadata['document_id'], []).append({
+                        "chunk_id": results['ids'][i],
+                        "content": results['documents'][i],
+                        "metadata": metadata
+                    })
+            
+            return [
+                sorted(chunks_by_document[document_id], key=lambda x: x['metadata']['chunk_index'])
+                for document_id in document_ids
+            ]
+            
+        except Exception as e:
+            raise Exception(f"Error retrieving document chunks: {str(e)}")
+    
     def delete_document_chunks(self, document_id: int) -> bool:
         """Delete all chunks for a specific document"""
         try:
@@ -409,3 +501,13 @@ class VectorPipeline:
             
         except Exception as e:
             return {"error": str(e)}
+    
+    def get_embedding_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and occupancy of the embedding cache"""
+        with self._embedding_cache_lock:
+            return {
+                "size": len(self._embedding_cache),
+                "max_size": EMBEDDING_CACHE_SIZE,
+                "hits": self._embedding_cache_hits,
+                "misses": self._embedding_cache_misses
+            }
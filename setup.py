@@ -3,11 +3,51 @@
 Setup script for Document Manager API with Vector Pipeline
 """
 
+import hashlib
+import json
 import os
 import subprocess
 import sys
 from pathlib import Path
 
+# Records which setup probes already passed; delete the file to force a full re-check
+SETUP_CACHE_PATH = Path(".setup_cache.json")
+
+def _requirements_sha():
+    """Hash requirements.txt so the setup cache is invalidated when it changes"""
+    try:
+        return hashlib.sha1(Path("requirements.txt").read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+def _cache_key():
+    """Identify the environment the setup probes ran in: requirements, Python version, and install prefix"""
+    return {
+        "requirements_sha": _requirements_sha(),
+        "py": list(sys.version_info[:2]),
+        "prefix": sys.prefix,
+    }
+
+def load_setup_cache():
+    """Return the cached setup state if it was recorded for this environment and requirements.txt"""
+    try:
+        cache = json.loads(SETUP_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+    
+    if any(cache.get(name) != value for name, value in _cache_key().items()):
+        return {}
+    return cache
+
+def save_setup_cache(**state):
+    """Merge the given probe results into the setup cache"""
+    cache = load_setup_cache()
+    cache.update(state, **_cache_key())
+    try:
+        SETUP_CACHE_PATH.write_text(json.dumps(cache, indent=2))
+    except OSError as e:
+        print(f"⚠️  Could not write setup cache: {e}")
+
 def check_python_version():
     """Check if Python version is compatible"""
     if sys.version_info < (3, 8):
@@ -30,11 +70,17 @@ def install_dependencies():
 def create_directories():
     """Create necessary directories"""
     print("\n📁 Creating directories...")
-    directories = ["uploads", "chroma_db"]
-    
+    directories = ("uploads", "chroma_db")
+
     for directory in directories:
-        Path(directory).mkdir(exist_ok=True)
-        print(f"✅ Created directory: {directory}")
+        # A single mkdir both probes and creates; existing dirs are the common case
+        try:
+            Path(directory).mkdir()
+            print(f"✅ Created directory: {directory}")
+        except FileExistsError:
+            # Only an existing directory is fine; a regular file in its place is not
+            if not Path(directory).is_dir():
+                raise
 
 def check_env_file():
     """Check if .env file exists and guide user to create it"""
@@ -101,8 +147,13 @@ def main():
     if not check_python_version():
         sys.exit(1)
     
+    cache = load_setup_cache()
+    dependencies_ok = cache.get("dependencies_ok", False)
+    
     # Install dependencies
-    if not install_dependencies():
+    if dependencies_ok:
+        print("\n✅ cached: dependencies already installed and validated")
+    elif not install_dependencies():
         sys.exit(1)
     
     # Create directories
@@ -112,9 +163,11 @@ def main():
     env_ready = check_env_file()
     
     # Test imports
-    if not test_imports():
-        print("\n❌ Some imports failed. Please check the installation.")
-        sys.exit(1)
+    if not dependencies_ok:
+        if not test_imports():
+            print("\n❌ Some imports failed. Please check the installation.")
+            sys.exit(1)
+        save_setup_cache(dependencies_ok=True)
     
     print("\n" + "=" * 60)
     if env_ready:
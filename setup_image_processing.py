@@ -9,6 +9,8 @@ import sys
 import subprocess
 import platform
 
+from setup import load_setup_cache, save_setup_cache
+
 def run_command(command, description):
     """Run a command and handle errors"""
     print(f"🔄 {description}...")
@@ -181,8 +183,14 @@ def main():
     
     # Check current status
     print("📋 Current Status:")
-    missing_packages = check_python_packages()
-    tesseract_installed = check_tesseract()
+    cache = load_setup_cache()
+    if cache.get("image_packages_ok") and cache.get("tesseract_ok"):
+        print("✅ cached: Python packages and Tesseract OCR already validated")
+        missing_packages = []
+        tesseract_installed = True
+    else:
+        missing_packages = check_python_packages()
+        tesseract_installed = check_tesseract()
     groq_configured = check_groq_api_key()
     
     # Install missing components
@@ -207,6 +215,7 @@ def main():
     # Test the setup
     print("\n🎯 Testing the complete setup...")
     if test_setup():
+        save_setup_cache(image_packages_ok=True, tesseract_ok=True)
         print("\n🎉 Image processing setup is complete!")
         print("\n📚 Next steps:")
         print("1. Make sure your .env file contains your Groq API key")
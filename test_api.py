@@ -4,7 +4,8 @@ Test script for the Document Manager API
 """
 import requests
 import os
-import json
+
+from api_test_helpers import json_loads, json_pretty
 
 BASE_URL = "http://localhost:8000"
 
@@ -13,7 +14,7 @@ def test_root():
     print("Testing root endpoint...")
     response = requests.get(f"{BASE_URL}/")
     print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Response: {json_pretty(json_loads(response.content))}")
     print()
 
 def test_upload():
@@ -33,7 +34,7 @@ def test_upload():
     
     print(f"Upload Status: {response.status_code}")
     if response.status_code == 200:
-        doc_data = response.json()
+        doc_data = json_loads(response.content)
         print(f"Uploaded Document ID: {doc_data['id']}")
         print(f"Original Filename: {doc_data['original_filename']}")
         print(f"File Size: {doc_data['file_size']} bytes")
@@ -51,7 +52,7 @@ def test_list_documents():
     response = requests.get(f"{BASE_URL}/api/documents")
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
-        documents = response.json()
+        documents = json_loads(response.content)
         print(f"Found {len(documents)} documents:")
         for doc in documents:
             print(f"  - ID: {doc['id']}, Name: {doc['original_filename']}, Size: {doc['file_size']} bytes")
@@ -65,8 +66,8 @@ def test_get_document(doc_id):
     response = requests.get(f"{BASE_URL}/api/documents/{doc_id}")
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
-        doc = response.json()
-        print(f"Document: {json.dumps(doc, indent=2)}")
+        doc = json_loads(response.content)
+        print(f"Document: {json_pretty(doc)}")
     else:
         print(f"Failed to get document: {response.text}")
     print()
@@ -77,7 +78,7 @@ def test_delete_document(doc_id):
     response = requests.delete(f"{BASE_URL}/api/documents/{doc_id}")
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
-        print(f"Response: {response.json()}")
+        print(f"Response: {json_loads(response.content)}")
     else:
         print(f"Failed to delete document: {response.text}")
     print()
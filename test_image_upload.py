@@ -6,138 +6,145 @@ Tests the complete image processing pipeline through the API
 
 import os
 import sys
+import time
 import requests
 from pathlib import Path
 
+from api_test_helpers import BASE_URL, SESSION, flush_log, json_loads, log, post_json, upload_batch
+
+# Backoff schedule (seconds) for retrying a search that finds nothing indexed yet
+SEARCH_RETRY_DELAYS = (0.05, 0.1, 0.2, 0.4, 0.8, 1.6)
+
 def test_image_upload():
     """Test image upload and processing through the API"""
     
-    # API endpoint
-    base_url = "http://localhost:8000"
-    upload_url = f"{base_url}/upload"
-    
     # Check if uploads directory exists and contains images
     uploads_dir = Path("uploads")
     if not uploads_dir.exists():
-        print("❌ Uploads directory not found")
+        log.info("❌ Uploads directory not found")
         return False
     
-    # Find image files
-    image_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff']
-    image_files = []
-    
-    for ext in image_extensions:
-        image_files.extend(uploads_dir.glob(f"*{ext}"))
-        image_files.extend(uploads_dir.glob(f"*{ext.upper()}"))
+    # Find image files with a single directory scan
+    image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff'}
+    with os.scandir(uploads_dir) as entries:
+        image_files = [
+            Path(entry.path) for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in image_extensions
+        ]
     
     if not image_files:
-        print("❌ No image files found in uploads/ directory")
-        print("Please add some image files to test with")
+        log.info("❌ No image files found in uploads/ directory")
+        log.info("Please add some image files to test with")
         return False
     
-    print(f"✅ Found {len(image_files)} image file(s) to test with")
+    log.info(f"✅ Found {len(image_files)} image file(s) to test with")
     
     # Test with the first image file
     test_image = image_files[0]
-    print(f"🧪 Testing with: {test_image.name}")
+    log.info(f"🧪 Testing with: {test_image.name}")
     
     # Check if API is running
     try:
-        response = requests.get(f"{base_url}/docs")
-        print("✅ API is running")
+        response = SESSION.get(f"{BASE_URL}/docs")
+        log.info("✅ API is running")
     except requests.exceptions.ConnectionError:
-        print("❌ API is not running")
-        print("Please start the API with: uvicorn app:app --reload")
+        log.info("❌ API is not running")
+        log.info("Please start the API with: uvicorn app:app --reload")
         return False
     
     # Upload the image
     try:
-        with open(test_image, 'rb') as f:
-            files = {'file': (test_image.name, f, 'image/jpeg')}
-            data = {'description': 'Test image upload for OCR processing'}
-            
-            print(f"📤 Uploading {test_image.name}...")
-            response = requests.post(upload_url, files=files, data=data)
+        log.info(f"📤 Uploading {test_image.name}...")
+        response = upload_batch(SESSION, [test_image], 'Test image upload for OCR processing')
+        
+        if response.status_code == 200:
+            upload_result = json_loads(response.content)
+            for error in upload_result['errors']:
+                log.info(f"❌ Image upload failed: {error}")
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Image upload successful!")
-                print(f"   Document ID: {result['id']}")
-                print(f"   Filename: {result['filename']}")
-                print(f"   Content Type: {result['content_type']}")
+            for result in upload_result['documents']:
+                log.info("✅ Image upload successful!")
+                log.info(f"   Document ID: {result['id']}")
+                log.info(f"   Filename: {result['filename']}")
+                log.info(f"   Content Type: {result['content_type']}")
                 
                 if result.get('processing_result'):
                     proc_result = result['processing_result']
-                    print(f"   Processing Status: {proc_result.get('status', 'unknown')}")
+                    log.info(f"   Processing Status: {proc_result.get('status', 'unknown')}")
                     if proc_result.get('total_chunks'):
-                        print(f"   Total Chunks: {proc_result['total_chunks']}")
+                        log.info(f"   Total Chunks: {proc_result['total_chunks']}")
                     if proc_result.get('total_tokens'):
-                        print(f"   Total Tokens: {proc_result['total_tokens']}")
+                        log.info(f"   Total Tokens: {proc_result['total_tokens']}")
                 else:
-                    print("   Processing Result: Not available")
-                
-                return True
-            else:
-                print(f"❌ Image upload failed: {response.status_code}")
-                print(f"   Response: {response.text}")
-                return False
-                
+                    log.info("   Processing Result: Not available")
+            
+            return bool(upload_result['documents'])
+        else:
+            log.info(f"❌ Image upload failed: {response.status_code}")
+            log.info(f"   Response: {response.text}")
+            return False
+            
     except Exception as e:
-        print(f"❌ Error during upload: {e}")
+        log.info(f"❌ Error during upload: {e}")
         return False
 
 def test_image_search():
     """Test searching for uploaded images"""
     
-    base_url = "http://localhost:8000"
-    search_url = f"{base_url}/search"
+    search_url = f"{BASE_URL}/api/search"
     
     # Test search with a generic query
     try:
         search_data = {
             "query": "image document",
-            "limit": 5
+            "n_results": 5
         }
         
-        print("\n🔍 Testing image search...")
-        response = requests.post(search_url, json=search_data)
+        log.info("\n🔍 Testing image search...")
+        # Retry with backoff while the index comes back empty instead of sleeping a fixed time
+        for delay in SEARCH_RETRY_DELAYS + (None,):
+            response = post_json(SESSION, search_url, search_data)
+            if response.status_code != 200 or json_loads(response.content) or delay is None:
+                break
+            time.sleep(delay)
         
         if response.status_code == 200:
-            result = response.json()
-            print("✅ Search successful!")
-            print(f"   Found {len(result)} results")
+            result = json_loads(response.content)
+            log.info("✅ Search successful!")
+            log.info(f"   Found {len(result)} results")
             
             for i, doc in enumerate(result[:3]):  # Show first 3 results
-                print(f"   {i+1}. {doc.get('original_filename', 'Unknown')} - {doc.get('content_type', 'Unknown')}")
+                metadata = doc.get('metadata', {})
+                log.info(f"   {i+1}. {metadata.get('original_filename', 'Unknown')} - {metadata.get('content_type', 'Unknown')}")
             
             return True
         else:
-            print(f"❌ Search failed: {response.status_code}")
+            log.info(f"❌ Search failed: {response.status_code}")
             return False
             
     except Exception as e:
-        print(f"❌ Error during search: {e}")
+        log.info(f"❌ Error during search: {e}")
         return False
 
 if __name__ == "__main__":
-    print("🧪 Testing Image Upload and Processing...\n")
+    log.info("🧪 Testing Image Upload and Processing...\n")
     
     # Test upload
     upload_success = test_image_upload()
+    flush_log()
     
     if upload_success:
-        # Wait a bit for processing to complete
-        import time
-        print("\n⏳ Waiting for processing to complete...")
-        time.sleep(3)
+        # The upload endpoint runs vector processing before it responds;
+        # the search still retries briefly in case the index lags behind
         
         # Test search
         search_success = test_image_search()
+        flush_log()
         
         if search_success:
-            print("\n🎉 All image processing tests passed!")
+            log.info("\n🎉 All image processing tests passed!")
         else:
-            print("\n❌ Image search test failed")
+            log.info("\n❌ Image search test failed")
     else:
-        print("\n❌ Image upload test failed")
+        log.info("\n❌ Image upload test failed")
         sys.exit(1)
@@ -4,119 +4,117 @@ Test script for PDF support in the vector pipeline
 """
 
 import requests
-import os
-from pathlib import Path
+import io
+from functools import lru_cache
 
-# API base URL
-BASE_URL = "http://localhost:8000"
+from api_test_helpers import BASE_URL, SESSION, cached_fixture, delete_documents, flush_log, json_loads, log, post_json, upload_batch
+
+# Fallback fixture used when reportlab is not installed
+FALLBACK_FIXTURE = ("test_document.txt", b"Test Document\nThis is a test document for the vector pipeline.")
+
+@lru_cache(maxsize=1)
+def build_test_pdf():
+    """Load the test PDF from the fixture cache, rendering it only when missing or stale"""
+    return cached_fixture("test_document.pdf", _render_test_pdf, __file__)
+
+def _render_test_pdf():
+    """Render the test PDF into memory with reportlab"""
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+    
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    c.drawString(100, 750, "Test PDF Document")
+    c.drawString(100, 720, "This is a test PDF for the vector pipeline.")
+    c.drawString(100, 700, "It contains text that should be extracted")
+    c.drawString(100, 680, "and processed into embeddings.")
+    c.drawString(100, 640, "The system should be able to:")
+    c.drawString(100, 620, "1. Extract text from this PDF")
+    c.drawString(100, 600, "2. Chunk the text appropriately")
+    c.drawString(100, 580, "3. Generate embeddings for search")
+    c.save()
+    return buffer.getvalue()
 
 def test_pdf_upload():
     """Test PDF document upload and processing"""
-    print("🧪 Testing PDF Support")
-    print("=" * 40)
-    
-    # Create a simple test PDF
-    test_dir = Path("test_pdf")
-    test_dir.mkdir(exist_ok=True)
-    
-    pdf_file = test_dir / "test_document.pdf"
+    log.info("🧪 Testing PDF Support")
+    log.info("=" * 40)
     
+    # Create a simple test PDF in memory
     try:
-        # Try to create a PDF using reportlab
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.pagesizes import letter
-        
-        c = canvas.Canvas(str(pdf_file), pagesize=letter)
-        c.drawString(100, 750, "Test PDF Document")
-        c.drawString(100, 720, "This is a test PDF for the vector pipeline.")
-        c.drawString(100, 700, "It contains text that should be extracted")
-        c.drawString(100, 680, "and processed into embeddings.")
-        c.drawString(100, 640, "The system should be able to:")
-        c.drawString(100, 620, "1. Extract text from this PDF")
-        c.drawString(100, 600, "2. Chunk the text appropriately")
-        c.drawString(100, 580, "3. Generate embeddings for search")
-        c.save()
-        print("✅ Created test PDF document")
+        fixture = ("test_document.pdf", build_test_pdf())
+        log.info("✅ Created test PDF document")
         
     except ImportError:
-        print("⚠️  reportlab not available - creating text file instead")
-        # Fallback to text file
-        pdf_file = test_dir / "test_document.txt"
-        with open(pdf_file, "w") as f:
-            f.write("Test Document\nThis is a test document for the vector pipeline.")
+        log.info("⚠️  reportlab not available - uploading a text document instead")
+        fixture = FALLBACK_FIXTURE
     
     # Test upload
-    print(f"\n📤 Uploading {pdf_file.name}...")
+    log.info(f"\n📤 Uploading {fixture[0]}...")
     
     try:
-        with open(pdf_file, "rb") as f:
-            files = {"file": (pdf_file.name, f.read(), "application/pdf")}
-            data = {"description": "Test PDF document for vector processing"}
-            
-            response = requests.post(f"{BASE_URL}/api/documents/upload", files=files, data=data)
+        response = upload_batch(SESSION, [fixture], "Test PDF document for vector processing")
+        
+        if response.status_code == 200:
+            upload_result = json_loads(response.content)
+            for error in upload_result['errors']:
+                log.info(f"❌ Upload failed: {error}")
             
-            if response.status_code == 200:
-                doc_info = response.json()
-                print(f"✅ Upload successful! Document ID: {doc_info['id']}")
+            for doc_info in upload_result['documents']:
+                log.info(f"✅ Upload successful! Document ID: {doc_info['id']}")
                 
                 # Check vector processing
                 if doc_info.get("processing_result"):
                     proc_result = doc_info["processing_result"]
                     if proc_result["status"] == "processed":
-                        print(f"   📊 Vector processing successful:")
-                        print(f"      - Chunks: {proc_result['total_chunks']}")
-                        print(f"      - Tokens: {proc_result['total_tokens']}")
+                        log.info(f"   📊 Vector processing successful:")
+                        log.info(f"      - Chunks: {proc_result['total_chunks']}")
+                        log.info(f"      - Tokens: {proc_result['total_tokens']}")
                     else:
-                        print(f"   ⚠️  Vector processing failed: {proc_result.get('error', 'Unknown error')}")
+                        log.info(f"   ⚠️  Vector processing failed: {proc_result.get('error', 'Unknown error')}")
                 else:
-                    print("   ℹ️  No vector processing result available")
-                
+                    log.info("   ℹ️  No vector processing result available")
+            
+            if upload_result['documents']:
                 # Test search functionality
-                print(f"\n🔍 Testing search functionality...")
+                log.info(f"\n🔍 Testing search functionality...")
                 search_data = {"query": "test document vector pipeline", "n_results": 3}
-                search_response = requests.post(f"{BASE_URL}/api/search", json=search_data)
+                search_response = post_json(SESSION, f"{BASE_URL}/api/search", search_data)
                 
                 if search_response.status_code == 200:
-                    results = search_response.json()
-                    print(f"   ✅ Search successful! Found {len(results)} results")
+                    results = json_loads(search_response.content)
+                    log.info(f"   ✅ Search successful! Found {len(results)} results")
                     for i, result in enumerate(results[:2]):
                         score = result['similarity_score']
                         filename = result['metadata']['original_filename']
-                        print(f"      {i+1}. {filename} (Score: {score:.3f})")
-                else:
-                    print(f"   ❌ Search failed: {search_response.status_code}")
-                
-                # Clean up - delete the document
-                print(f"\n🧹 Cleaning up test document...")
-                delete_response = requests.delete(f"{BASE_URL}/api/documents/{doc_info['id']}")
-                if delete_response.status_code == 200:
-                    print("   ✅ Document deleted successfully")
+                        log.info(f"      {i+1}. {filename} (Score: {score:.3f})")
                 else:
-                    print(f"   ❌ Failed to delete document: {delete_response.status_code}")
+                    log.info(f"   ❌ Search failed: {search_response.status_code}")
                 
-            else:
-                print(f"❌ Upload failed: {response.status_code} - {response.text}")
+                # Clean up - delete the uploaded documents
+                log.info(f"\n🧹 Cleaning up test documents...")
+                doc_ids = [doc_info['id'] for doc_info in upload_result['documents']]
+                for doc_id, delete_response in zip(doc_ids, delete_documents(SESSION, doc_ids)):
+                    if delete_response.status_code == 200:
+                        log.info(f"   ✅ Document {doc_id} deleted successfully")
+                    else:
+                        log.info(f"   ❌ Failed to delete document {doc_id}: {delete_response.status_code}")
+            
+        else:
+            log.info(f"❌ Upload failed: {response.status_code} - {response.text}")
                 
     except requests.exceptions.ConnectionError:
-        print("❌ Could not connect to the API. Make sure the server is running on localhost:8000")
+        log.info("❌ Could not connect to the API. Make sure the server is running on localhost:8000")
     except Exception as e:
-        print(f"❌ Error during test: {e}")
-    
-    # Clean up test files
-    try:
-        if pdf_file.exists():
-            os.remove(pdf_file)
-        if test_dir.exists() and not any(test_dir.iterdir()):
-            test_dir.rmdir()
-    except:
-        pass
+        log.info(f"❌ Error during test: {e}")
     
-    print("\n" + "=" * 40)
-    print("🎉 PDF Support Test Completed!")
+    log.info("\n" + "=" * 40)
+    log.info("🎉 PDF Support Test Completed!")
 
 if __name__ == "__main__":
-    print("Document Manager API - PDF Support Test")
-    print("Make sure the server is running and PDF dependencies are installed")
-    print("=" * 40)
+    log.info("Document Manager API - PDF Support Test")
+    log.info("Make sure the server is running and PDF dependencies are installed")
+    log.info("=" * 40)
     
     test_pdf_upload()
+    flush_log()
@@ -3,6 +3,45 @@
 Simple test script for sentence-transformers integration
 """
 
+import os
+import sys
+from functools import lru_cache
+
+try:
+    import simsimd
+
+    def cosine_similarity(a, b):
+        """Cosine similarity of two embeddings using simsimd's SIMD kernels"""
+        return 1 - float(simsimd.cosine(a, b))
+except ImportError:
+    def cosine_similarity(a, b):
+        """Cosine similarity of two unit-normalized embeddings"""
+        return float(a @ b)
+
+@lru_cache(maxsize=1)
+def get_model(model_name='all-MiniLM-L6-v2'):
+    """Load the sentence-transformers model once per process"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+    
+    # On CPU, intra-op threads beyond the physical core count only add contention
+    if not torch.cuda.is_available():
+        torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+    return SentenceTransformer(model_name)
+
+def nearest_neighbours(embeddings, k):
+    """Rank the k most similar rows for each unit-normalized embedding by inner product"""
+    try:
+        import faiss
+    except ImportError:
+        import numpy as np
+        return np.argsort(-(embeddings @ embeddings.T), axis=1)[:, :k]
+    
+    index = faiss.IndexFlatIP(embeddings.shape[1])
+    index.add(embeddings)
+    _, neighbours = index.search(embeddings, k)
+    return neighbours
+
 def test_sentence_transformers():
     """Test sentence-transformers functionality"""
     print("🧪 Testing Sentence Transformers Integration")
@@ -11,12 +50,12 @@ def test_sentence_transformers():
     try:
         # Test import
         print("📦 Importing sentence-transformers...")
-        from sentence_transformers import SentenceTransformer
+        import sentence_transformers
         print("✅ Import successful")
         
         # Test model loading
         print("🔄 Loading model 'all-MiniLM-L6-v2'...")
-        model = SentenceTransformer('all-MiniLM-L6-v2')
+        model = get_model()
         print("✅ Model loaded successfully")
         
         # Test embedding generation
@@ -27,21 +66,34 @@ def test_sentence_transformers():
             "Natural language processing helps computers understand text."
         ]
         
-        embeddings = model.encode(test_texts, convert_to_tensor=False)
+        # Unit-normalized embeddings turn cosine similarity into a plain dot product.
+        # encode() already length-sorts inputs into batches and restores the order.
+        embeddings = model.encode(
+            test_texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
         print(f"✅ Generated embeddings: {embeddings.shape}")
         
         # Test similarity
         print("🔍 Testing similarity calculation...")
-        from sklearn.metrics.pairwise import cosine_similarity
-        
         # Calculate similarity between first and second sentence
-        similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
+        similarity = cosine_similarity(embeddings[0], embeddings[1])
         print(f"✅ Similarity between AI and ML sentences: {similarity:.3f}")
         
         # Test similarity between first and third sentence (should be lower)
-        similarity2 = cosine_similarity([embeddings[0]], [embeddings[2]])[0][0]
+        similarity2 = cosine_similarity(embeddings[0], embeddings[2])
         print(f"✅ Similarity between AI and NLP sentences: {similarity2:.3f}")
         
+        # The closest sentence to the AI one (after itself) should be the ML one
+        neighbours = nearest_neighbours(embeddings, k=len(test_texts))
+        if neighbours[0][1] != 1:
+            print(f"❌ Expected the ML sentence to rank closest to the AI sentence, got: {test_texts[neighbours[0][1]]}")
+            return False
+        print("✅ Nearest neighbour of the AI sentence is the ML sentence")
+        
         print("\n🎉 All tests passed! Sentence-transformers is working correctly.")
         return True
         
@@ -4,20 +4,80 @@ Test script for User Management System
 Tests user registration, authentication, sessions, and chat functionality
 """
 
+import logging
 import os
 import sys
+import threading
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from api_test_helpers import BASE_URL, SESSION, LazyText, flush_log, json_loads, log, new_session, post_json
+
+# Endpoints exercised below
+HEALTH_URL = f"{BASE_URL}/health"
+REGISTER_URL = f"{BASE_URL}/api/auth/register"
+LOGIN_URL = f"{BASE_URL}/api/auth/login"
+PROFILE_URL = f"{BASE_URL}/api/auth/profile"
+ACTIVITY_URL = f"{BASE_URL}/api/auth/activity"
+LOGOUT_URL = f"{BASE_URL}/api/auth/logout"
+CHAT_START_URL = f"{BASE_URL}/api/chat/start"
+CHAT_SEND_URL = f"{BASE_URL}/api/chat/send"
+CHAT_HISTORY_URL = f"{BASE_URL}/api/chat/history"
+
+# Records logged by each concurrent user flow are held per thread and written
+# out as one block when that flow finishes, so the flows do not interleave
+_flow_state = threading.local()
+_flow_output_lock = threading.Lock()
+
+class FlowBuffer(logging.Filter):
+    """Logger filter that diverts records into the current thread's flow buffer"""
+    
+    def filter(self, record):
+        records = getattr(_flow_state, "records", None)
+        if records is None:
+            return True
+        records.append(record)
+        return False
+
+log.addFilter(FlowBuffer())
+
+@contextmanager
+def buffered_flow_output():
+    """Hold this thread's log records and emit them together on exit"""
+    _flow_state.records = records = []
+    try:
+        yield
+    finally:
+        _flow_state.records = None
+        with _flow_output_lock:
+            for record in records:
+                log.handle(record)
+
+class APICallError(Exception):
+    """A request failed or the API reported success=False"""
+
+def expect_success(response, action):
+    """Decode a JSON API response, raising APICallError unless the call succeeded"""
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        log.debug("   Response: %s", LazyText(response))
+        raise APICallError(f"{action} request failed: {response.status_code}")
+    
+    result = json_loads(response.content)
+    if not result.get('success'):
+        raise APICallError(f"{action} failed: {result.get('error')}")
+    return result
+
 def test_user_registration():
     """Test user registration functionality"""
-    print("🧪 Testing User Registration...")
-    
-    base_url = "http://localhost:8000"
+    log.info("🧪 Testing User Registration...")
     
     # Test data
     test_users = [
@@ -37,321 +97,269 @@ def test_user_registration():
     
     registered_users = []
     
-    for user_data in test_users:
+    # Registrations are independent, so send them concurrently
+    with ThreadPoolExecutor(max_workers=min(8, len(test_users))) as executor:
+        futures = [
+            executor.submit(post_json, SESSION, REGISTER_URL, user_data)
+            for user_data in test_users
+        ]
+    
+    for user_data, future in zip(test_users, futures):
         try:
-            response = requests.post(
-                f"{base_url}/api/auth/register",
-                json=user_data
-            )
+            result = expect_success(future.result(), "Registration")
+            log.info(f"✅ User registered: {user_data['username']}")
+            registered_users.append({
+                'data': user_data,
+                'response': result
+            })
             
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('success'):
-                    print(f"✅ User registered: {user_data['username']}")
-                    registered_users.append({
-                        'data': user_data,
-                        'response': result
-                    })
-                else:
-                    print(f"❌ Registration failed: {result.get('error')}")
-            else:
-                print(f"❌ Registration request failed: {response.status_code}")
-                print(f"   Response: {response.text}")
-                
+        except APICallError as e:
+            log.info(f"❌ {e}")
         except Exception as e:
-            print(f"❌ Error during registration: {e}")
+            log.info(f"❌ Error during registration: {e}")
     
     return registered_users
 
-def test_user_authentication():
+def test_user_authentication(session, user_data):
     """Test user authentication functionality"""
-    print("\n🔐 Testing User Authentication...")
-    
-    base_url = "http://localhost:8000"
+    log.info("\n🔐 Testing User Authentication...")
     
     # Test login with valid credentials
     test_credentials = {
-        "username": "testuser1",
-        "password": "testpass123"
+        "username": user_data["username"],
+        "password": user_data["password"]
     }
     
     try:
-        response = requests.post(
-            f"{base_url}/api/auth/login",
-            json=test_credentials
-        )
+        result = expect_success(post_json(session, LOGIN_URL, test_credentials), "Authentication")
+        # Every later request on this session authenticates with the new token
+        session.headers["Authorization"] = f"Bearer {result['session_token']}"
+        log.info("✅ User authentication successful")
+        log.info(f"   Session token: {result['session_token'][:20]}...")
+        log.info(f"   Expires at: {result['expires_at']}")
+        return result['session_token']
         
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('success'):
-                print("✅ User authentication successful")
-                print(f"   Session token: {result['session_token'][:20]}...")
-                print(f"   Expires at: {result['expires_at']}")
-                return result['session_token']
-            else:
-                print(f"❌ Authentication failed: {result.get('error')}")
-        else:
-            print(f"❌ Authentication request failed: {response.status_code}")
-            print(f"   Response: {response.text}")
-            
+    except APICallError as e:
+        log.info(f"❌ {e}")
     except Exception as e:
-        print(f"❌ Error during authentication: {e}")
+        log.info(f"❌ Error during authentication: {e}")
     
     return None
 
-def test_session_validation(session_token):
+def test_session_validation(session, session_token):
     """Test session validation"""
-    print("\n🔍 Testing Session Validation...")
+    log.info("\n🔍 Testing Session Validation...")
     
     if not session_token:
-        print("❌ No session token available for testing")
+        log.info("❌ No session token available for testing")
         return False
     
-    base_url = "http://localhost:8000"
-    
-    headers = {
-        "Authorization": f"Bearer {session_token}"
-    }
-    
     try:
         # Test protected endpoint
-        response = requests.get(
-            f"{base_url}/api/auth/profile",
-            headers=headers
-        )
+        response = session.get(PROFILE_URL)
+        response.raise_for_status()
+        result = json_loads(response.content)
+        log.info("✅ Session validation successful")
+        log.info(f"   Username: {result.get('username')}")
+        log.info(f"   Email: {result.get('email')}")
+        log.info(f"   Subscription: {result.get('subscription_tier')}")
+        return True
         
-        if response.status_code == 200:
-            result = response.json()
-            print("✅ Session validation successful")
-            print(f"   Username: {result.get('username')}")
-            print(f"   Email: {result.get('email')}")
-            print(f"   Subscription: {result.get('subscription_tier')}")
-            return True
-        else:
-            print(f"❌ Session validation failed: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return False
-            
+    except requests.HTTPError as e:
+        log.info(f"❌ Session validation failed: {e.response.status_code}")
+        log.debug("   Response: %s", LazyText(e.response))
     except Exception as e:
-        print(f"❌ Error during session validation: {e}")
-        return False
+        log.info(f"❌ Error during session validation: {e}")
+    
+    return False
 
-def test_chat_functionality(session_token):
+def test_chat_functionality(session, session_token):
     """Test chat functionality"""
-    print("\n💬 Testing Chat Functionality...")
+    log.info("\n💬 Testing Chat Functionality...")
     
     if not session_token:
-        print("❌ No session token available for testing")
+        log.info("❌ No session token available for testing")
         return False
     
-    base_url = "http://localhost:8000"
-    headers = {
-        "Authorization": f"Bearer {session_token}"
-    }
-    
     try:
         # Start a conversation
-        response = requests.post(
-            f"{base_url}/api/chat/start",
-            headers=headers
-        )
+        result = expect_success(session.post(CHAT_START_URL), "Conversation start")
+        conversation_id = result['conversation_id']
+        log.info(f"✅ Conversation started: {conversation_id}")
         
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('success'):
-                conversation_id = result['conversation_id']
-                print(f"✅ Conversation started: {conversation_id}")
-                
-                # Send a message
-                message_data = {
-                    "content": "Hello, this is a test message!",
-                    "conversation_id": conversation_id
-                }
-                
-                response = requests.post(
-                    f"{base_url}/api/chat/send",
-                    headers=headers,
-                    json=message_data
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('success'):
-                        print("✅ Message sent successfully")
-                        
-                        # Get conversation history
-                        response = requests.get(
-                            f"{base_url}/api/chat/history",
-                            headers=headers,
-                            params={"conversation_id": conversation_id}
-                        )
-                        
-                        if response.status_code == 200:
-                            result = response.json()
-                            if result.get('success'):
-                                print(f"✅ Retrieved {result['total_messages']} messages")
-                                return True
-                            else:
-                                print(f"❌ Failed to get history: {result.get('error')}")
-                        else:
-                            print(f"❌ History request failed: {response.status_code}")
-                    else:
-                        print(f"❌ Message sending failed: {result.get('error')}")
-                else:
-                    print(f"❌ Message request failed: {response.status_code}")
-            else:
-                print(f"❌ Conversation start failed: {result.get('error')}")
-        else:
-            print(f"❌ Conversation start request failed: {response.status_code}")
-            
+        # Send a message
+        message_data = {
+            "content": "Hello, this is a test message!",
+            "conversation_id": conversation_id
+        }
+        
+        expect_success(post_json(session, CHAT_SEND_URL, message_data), "Message sending")
+        log.info("✅ Message sent successfully")
+        
+        # Get conversation history
+        response = session.get(CHAT_HISTORY_URL, params={"conversation_id": conversation_id})
+        result = expect_success(response, "History")
+        log.info(f"✅ Retrieved {result['total_messages']} messages")
+        return True
+        
+    except APICallError as e:
+        log.info(f"❌ {e}")
     except Exception as e:
-        print(f"❌ Error during chat testing: {e}")
+        log.info(f"❌ Error during chat testing: {e}")
     
     return False
 
-def test_user_stats(session_token):
+def test_user_stats(session, session_token):
     """Test user statistics and analytics"""
-    print("\n📊 Testing User Statistics...")
+    log.info("\n📊 Testing User Statistics...")
     
     if not session_token:
-        print("❌ No session token available for testing")
+        log.info("❌ No session token available for testing")
         return False
     
-    base_url = "http://localhost:8000"
-    headers = {
-        "Authorization": f"Bearer {session_token}"
-    }
-    
     try:
+        # Re-fetch the profile so its counters include the chat calls made above;
+        # it and the activity summary are independent, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            profile_future = executor.submit(session.get, PROFILE_URL)
+            activity_future = executor.submit(session.get, ACTIVITY_URL)
+        
         # Get user profile
-        response = requests.get(
-            f"{base_url}/api/auth/profile",
-            headers=headers
-        )
+        response = profile_future.result()
+        response.raise_for_status()
+        profile = json_loads(response.content)
+        log.info("✅ User profile retrieved")
+        log.info(f"   Total documents: {profile.get('total_documents')}")
+        log.info(f"   Total LLM calls: {profile.get('total_llm_calls')}")
+        log.info(f"   Total tokens: {profile.get('total_tokens_processed')}")
         
-        if response.status_code == 200:
-            profile = response.json()
-            print("✅ User profile retrieved")
-            print(f"   Total documents: {profile.get('total_documents')}")
-            print(f"   Total LLM calls: {profile.get('total_llm_calls')}")
-            print(f"   Total tokens: {profile.get('total_tokens_processed')}")
-            
-            # Get activity summary
-            response = requests.get(
-                f"{base_url}/api/auth/activity",
-                headers=headers
-            )
-            
-            if response.status_code == 200:
-                activity = response.json()
-                if activity.get('success'):
-                    print("✅ Activity summary retrieved")
-                    print(f"   Recent documents: {activity.get('recent_documents')}")
-                    print(f"   Activity counts: {activity.get('activity_counts')}")
-                    return True
-                else:
-                    print(f"❌ Activity retrieval failed: {activity.get('error')}")
-            else:
-                print(f"❌ Activity request failed: {response.status_code}")
-        else:
-            print(f"❌ Profile request failed: {response.status_code}")
-            
+        # Get activity summary
+        activity = expect_success(activity_future.result(), "Activity retrieval")
+        log.info("✅ Activity summary retrieved")
+        log.info(f"   Recent documents: {activity.get('recent_documents')}")
+        log.info(f"   Activity counts: {activity.get('activity_counts')}")
+        return True
+        
+    except requests.HTTPError as e:
+        log.info(f"❌ Profile request failed: {e.response.status_code}")
+    except APICallError as e:
+        log.info(f"❌ {e}")
     except Exception as e:
-        print(f"❌ Error during stats testing: {e}")
+        log.info(f"❌ Error during stats testing: {e}")
     
     return False
 
-def test_logout(session_token):
+def test_logout(session, session_token):
     """Test user logout"""
-    print("\n🚪 Testing User Logout...")
+    log.info("\n🚪 Testing User Logout...")
     
     if not session_token:
-        print("❌ No session token available for testing")
+        log.info("❌ No session token available for testing")
         return False
     
-    base_url = "http://localhost:8000"
-    
     try:
-        response = requests.post(
-            f"{base_url}/api/auth/logout",
-            json={"session_token": session_token}
-        )
+        expect_success(post_json(session, LOGOUT_URL, {"session_token": session_token}), "Logout")
+        del session.headers["Authorization"]
+        log.info("✅ User logged out successfully")
+        return True
         
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('success'):
-                print("✅ User logged out successfully")
-                return True
-            else:
-                print(f"❌ Logout failed: {result.get('error')}")
-        else:
-            print(f"❌ Logout request failed: {response.status_code}")
-            
+    except APICallError as e:
+        log.info(f"❌ {e}")
     except Exception as e:
-        print(f"❌ Error during logout: {e}")
+        log.info(f"❌ Error during logout: {e}")
     
     return False
 
+def run_user_flow(session, user_data):
+    """Run one user's tests, logging their output as a single block headed by the username"""
+    with buffered_flow_output():
+        log.info(f"\n👤 Testing as {user_data['username']}")
+        return run_user_tests(session, user_data)
+
+def run_user_tests(session, user_data):
+    """Run authentication through logout for one user on its own session"""
+    username = user_data["username"]
+    
+    # Test authentication
+    session_token = test_user_authentication(session, user_data)
+    
+    if not session_token:
+        log.info(f"❌ Authentication failed for {username}, cannot continue testing")
+        return False
+    
+    # Test session validation
+    if not test_session_validation(session, session_token):
+        log.info(f"❌ Session validation failed for {username}")
+        return False
+    
+    # Test chat functionality
+    if not test_chat_functionality(session, session_token):
+        log.info(f"❌ Chat functionality failed for {username}")
+        return False
+    
+    # Test user statistics
+    if not test_user_stats(session, session_token):
+        log.info(f"❌ User statistics failed for {username}")
+        return False
+    
+    # Test logout
+    if not test_logout(session, session_token):
+        log.info(f"❌ Logout failed for {username}")
+        return False
+    
+    return True
+
 def main():
     """Main test function"""
-    print("🚀 Testing User Management System...\n")
+    log.info("🚀 Testing User Management System...\n")
     
     # Check if API is running
     try:
-        response = requests.get("http://localhost:8000/docs")
-        print("✅ API is running")
+        response = SESSION.head(HEALTH_URL, timeout=2)
+        if response.status_code >= 500:
+            log.info(f"❌ API health check failed: {response.status_code}")
+            return False
+        log.info("✅ API is running")
     except requests.exceptions.ConnectionError:
-        print("❌ API is not running")
-        print("Please start the API with: uvicorn app:app --reload")
+        log.info("❌ API is not running")
+        log.info("Please start the API with: uvicorn app:app --reload")
         return False
     
     # Run tests
-    print("\n" + "="*50)
+    log.info("\n" + "="*50)
     
     # Test registration
     registered_users = test_user_registration()
     
     if not registered_users:
-        print("❌ No users registered, cannot continue testing")
-        return False
-    
-    # Test authentication
-    session_token = test_user_authentication()
-    
-    if not session_token:
-        print("❌ Authentication failed, cannot continue testing")
+        log.info("❌ No users registered, cannot continue testing")
         return False
     
-    # Test session validation
-    if not test_session_validation(session_token):
-        print("❌ Session validation failed")
-        return False
-    
-    # Test chat functionality
-    if not test_chat_functionality(session_token):
-        print("❌ Chat functionality failed")
-        return False
-    
-    # Test user statistics
-    if not test_user_stats(session_token):
-        print("❌ User statistics failed")
-        return False
+    # Drive every registered user through the remaining tests concurrently,
+    # each on its own session so the flows also check session isolation
+    users = [user['data'] for user in registered_users]
+    user_sessions = [new_session() for _ in users]
+    try:
+        with ThreadPoolExecutor(max_workers=len(users)) as executor:
+            results = list(executor.map(run_user_flow, user_sessions, users))
+    finally:
+        for session in user_sessions:
+            session.close()
     
-    # Test logout
-    if not test_logout(session_token):
-        print("❌ Logout failed")
+    if not all(results):
         return False
     
-    print("\n" + "="*50)
-    print("🎉 All user management tests passed!")
-    print("\n📚 Next steps:")
-    print("1. The user management system is working correctly")
-    print("2. You can now integrate it with your chatbot")
-    print("3. Users can register, authenticate, and maintain sessions")
-    print("4. Chat history and user analytics are fully functional")
+    log.info("\n" + "="*50)
+    log.info("🎉 All user management tests passed!")
+    log.info("\n📚 Next steps:")
+    log.info("1. The user management system is working correctly")
+    log.info("2. You can now integrate it with your chatbot")
+    log.info("3. Users can register, authenticate, and maintain sessions")
+    log.info("4. Chat history and user analytics are fully functional")
     
     return True
 
 if __name__ == "__main__":
     success = main()
+    flush_log()
     sys.exit(0 if success else 1)